@@ -0,0 +1,349 @@
+import csv
+import html
+
+from kennel_index import kennel_positions, occupied_sublocations
+
+# Every area map is described by three CSV files instead of code:
+#   areas.csv         - one row per area (selectbox order): the outer grid
+#                       its sections sit in, max width, aspect ratio and the
+#                       iframe height
+#   area_sections.csv - the sub-grids of an area (e.g. Birds / Reptiles),
+#                       placed on the area grid by X, Y, Width, Height, with
+#                       an optional heading. OccupiedOnly sections list only
+#                       the kennels that have animals.
+#   area_layout.csv   - one row per kennel, placed on its section grid by
+#                       X, Y, Width, Height (the old shelter_layout_template.csv
+#                       columns).
+#                       Blank X/Y flows the kennel into the next free cell,
+#                       SubLocation "a|b" merges kennels, a blank SubLocation
+#                       is the whole room and "*" is every occupied one.
+AREAS_PATH = "areas.csv"
+AREA_SECTIONS_PATH = "area_sections.csv"
+AREA_LAYOUT_PATH = "area_layout.csv"
+REGISTRY_PATHS = [AREAS_PATH, AREA_SECTIONS_PATH, AREA_LAYOUT_PATH]
+
+ALL_SUBLOCATIONS = "*"
+
+# How area maps reach the browser, chosen per deployment with the
+# ROUNDS_RENDER_MODE environment variable:
+#   iframe - a components.html iframe per area, linking the shared CSS/JS
+#   inline - the grid injected straight into the page with st.html, styles
+#            installed once; no script runs, so kennel text is sized by the
+#            CSS container queries instead of the fitting in area.js
+#   json   - a compact payload (area_payload) rendered in the browser by
+#            assets/area_client.js
+RENDER_MODE_VARIABLE = "ROUNDS_RENDER_MODE"
+RENDER_MODES = ["iframe", "inline", "json"]
+
+# The shared stylesheet and script are linked, not inlined (see assets.py)
+PAGE_TEMPLATE = '<link rel="stylesheet" href="{css}"><script src="{js}"></script>{body}'
+INLINE_TEMPLATE = '<div class="area-inline">{body}</div>'
+AREA_OPEN = '<div class="area-map" style="{style}">'
+SECTION_OPEN = '<div class="area-section" style="{placement}">{heading}<div class="area-grid" style="{grid}">'
+HEADING_TEMPLATE = '<div class="area-heading">{}</div>'
+CELL_OPEN = '<div class="kennel-block" style="{placement}"><div class="kennel-label-small">{label}</div><div class="kennel-animal-list">'
+CELL_CLOSE = "</div></div>"
+SECTION_CLOSE = "</div></div>"
+AREA_CLOSE = "</div>"
+ANIMAL_TEMPLATE = '<div class="kennel-animal">{}</div>'
+EMPTY_KENNEL = ANIMAL_TEMPLATE.format("-")
+KENNEL_MEMO_LIMIT = 5000
+
+# A kennel's animal DisplayKeys, in order -> its animal-list HTML. Shared
+# across areas and data versions, so after a refresh only kennels whose
+# animals changed are rebuilt.
+_kennel_html = {}
+
+
+def _read_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [{key: (value or "").strip() for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+def _placement(row):
+    # X/Y/Width/Height (0-based, in grid cells) -> CSS grid placement
+    if not row.get("X") or not row.get("Y"):
+        return ""
+    return "grid-column: {} / span {}; grid-row: {} / span {};".format(
+        int(row["X"]) + 1, int(row.get("Width") or 1), int(row["Y"]) + 1, int(row.get("Height") or 1)
+    )
+
+
+def _sublocations(value):
+    if not value:
+        return None
+    if "|" in value:
+        return [part.strip() for part in value.split("|")]
+    return value
+
+
+def read_area_registry(areas_path=AREAS_PATH, sections_path=AREA_SECTIONS_PATH, layout_path=AREA_LAYOUT_PATH):
+    # area name -> {"height", "style", "sections": [{..., "cells": [...]}]},
+    # in areas.csv order
+    registry = {}
+    for row in _read_rows(areas_path):
+        style = f"max-width: {int(row['MaxWidth'] or 1400)}px; grid-template-columns: {row['Columns'] or '1fr'}; grid-template-rows: {row['Rows'] or '1fr'};"
+        if row["AspectRatio"]:
+            style += f" aspect-ratio: {row['AspectRatio']};"
+        registry[row["Area"]] = {"height": int(row["Height"] or 2000), "style": style, "sections": {}}
+
+    for row in _read_rows(sections_path):
+        grid = f"grid-template-columns: {row['Columns'] or '1fr'};"
+        grid += f" grid-template-rows: {row['Rows']};" if row["Rows"] else " grid-auto-rows: 1fr;"
+        registry[row["Area"]]["sections"][row["Section"]] = {
+            "placement": _placement(row),
+            "title": row["Heading"],
+            "heading": HEADING_TEMPLATE.format(html.escape(row["Heading"])) if row["Heading"] else "",
+            "grid": grid,
+            "occupied_only": row["OccupiedOnly"].upper() in ("Y", "YES", "TRUE", "1"),
+            "cells": [],
+        }
+
+    for row in _read_rows(layout_path):
+        registry[row["Area"]]["sections"][row["Section"]]["cells"].append({
+            "label": row["Label"],
+            "location": row["Location_1"],
+            "sublocations": _sublocations(row["SubLocation"]),
+            "placement": _placement(row),
+        })
+
+    for area in registry.values():
+        area["sections"] = list(area["sections"].values())
+    return registry
+
+
+def compile_area(area):
+    # Flatten an area into static HTML chunks with kennel slots between them,
+    # so rendering only fills in animal lists. OccupiedOnly sections depend
+    # on who is where and stay as a single slot, expanded at render time.
+    parts = [AREA_OPEN.format(style=area["style"])]
+    for section in area["sections"]:
+        parts[-1] += SECTION_OPEN.format(**section)
+        if section["occupied_only"]:
+            parts += [("section", section), ""]
+        else:
+            for cell in section["cells"]:
+                parts[-1] += CELL_OPEN.format(placement=cell["placement"], label=html.escape(cell["label"]))
+                parts += [("cell", cell), CELL_CLOSE]
+        parts[-1] += SECTION_CLOSE
+    parts[-1] += AREA_CLOSE
+    return {"height": area["height"], "parts": parts}
+
+
+def compile_areas(registry):
+    return {name: compile_area(area) for name, area in registry.items()}
+
+
+def _animal_list(lines, keys, positions):
+    if not positions:
+        return EMPTY_KENNEL
+    memo_key = tuple(keys[pos] for pos in positions)
+    animal_html = _kennel_html.get(memo_key)
+    if animal_html is None:
+        if len(_kennel_html) > KENNEL_MEMO_LIMIT:
+            _kennel_html.clear()
+        animal_html = _kennel_html[memo_key] = "".join(ANIMAL_TEMPLATE.format(lines[pos]) for pos in positions)
+    return animal_html
+
+
+def _occupied_cells(section, index):
+    # (label, positions) for every kennel in the section with animals in it
+    for cell in section["cells"]:
+        if cell["sublocations"] == ALL_SUBLOCATIONS:
+            for sublocation in occupied_sublocations(index, cell["location"]):
+                yield sublocation, kennel_positions(index, cell["location"], sublocation)
+        else:
+            positions = kennel_positions(index, cell["location"], cell["sublocations"])
+            if positions:
+                yield cell["label"], positions
+
+
+def render_area(compiled, index, lines, keys):
+    # compiled: from compile_area; index: kennel index; lines and keys: the
+    # DisplayLine and DisplayKey of each inventory row, by position
+    out = []
+    for part in compiled["parts"]:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        kind, item = part
+        if kind == "cell":
+            out.append(_animal_list(lines, keys, kennel_positions(index, item["location"], item["sublocations"])))
+        else:
+            for label, positions in _occupied_cells(item, index):
+                out.append(CELL_OPEN.format(placement="", label=html.escape(label)))
+                out.append(_animal_list(lines, keys, positions))
+                out.append(CELL_CLOSE)
+    return "".join(out)
+
+
+def render_area_page(compiled, index, lines, keys, asset_urls):
+    # asset_urls: {"css": ..., "js": ...} from assets.build_assets
+    return PAGE_TEMPLATE.format(body=render_area(compiled, index, lines, keys), **asset_urls)
+
+
+def render_area_inline(compiled, index, lines, keys):
+    return INLINE_TEMPLATE.format(body=render_area(compiled, index, lines, keys))
+
+
+ANIMAL_FIELDS = ["number", "name", "stage", "hold", "date", "mask"]
+DICTIONARY_FIELDS = {"stage": "stages", "hold": "holds", "date": "dates"}
+MASK_FIELD = ANIMAL_FIELDS.index("mask")
+
+
+def area_payload(area, index, columns, dictionaries, key):
+    # The json render mode's payload for one area (from read_area_registry):
+    # its layout, with each kennel as [label, placement, animals] and each
+    # animal as a [number, name, stage, hold, date, mask] row whose codes
+    # index the shared dictionaries and whose mask bits are the dictionaries'
+    # filters (see display.display_records). key is "<area>|<data version>",
+    # so the client can skip repeats.
+    def animal_rows(positions):
+        return [[columns[field][pos] for field in ANIMAL_FIELDS] for pos in positions]
+
+    sections = []
+    for section in area["sections"]:
+        if section["occupied_only"]:
+            cells = [[label, "", animal_rows(positions)] for label, positions in _occupied_cells(section, index)]
+        else:
+            cells = [
+                [cell["label"], cell["placement"], animal_rows(kennel_positions(index, cell["location"], cell["sublocations"]))]
+                for cell in section["cells"]
+            ]
+        sections.append({"placement": section["placement"], "heading": section["title"], "grid": section["grid"], "cells": cells})
+    return {"key": key, "style": area["style"], "sections": sections, **dictionaries}
+
+
+def _payload_area(payload):
+    return payload["key"].rsplit("|", 1)[0]
+
+
+def _layout_signature(payload):
+    return payload["style"], [
+        (section["placement"], section["heading"], section["grid"], [cell[:2] for cell in section["cells"]])
+        for section in payload["sections"]
+    ]
+
+
+def _decoded_animals(animals, payload):
+    # Codes and mask bits aren't comparable across data versions (the
+    # dictionaries are rebuilt), so compare what they stand for
+    def decode(field, value):
+        if field == "mask":
+            return [name for bit, name in enumerate(payload["filters"]) if value >> bit & 1]
+        if field in DICTIONARY_FIELDS:
+            return payload[DICTIONARY_FIELDS[field]][value] if value >= 0 else None
+        return value
+
+    return [[decode(field, value) for field, value in zip(ANIMAL_FIELDS, row)] for row in animals]
+
+
+def _masks(animals):
+    return [row[MASK_FIELD] for row in animals]
+
+
+def payload_patch(previous, payload):
+    # What to send a map that currently shows `previous` so it shows
+    # `payload`: the whole payload if nothing is shown yet, it's another area
+    # (even one laid out the same) or the layout differs (occupied-only
+    # kennels came or went), otherwise a patch of just the kennels whose
+    # animals changed, as [section number, label, animals], to apply on top
+    # of `base`. A kennel whose masks changed is sent too: the map filters
+    # the lines it keeps by their mask as numbered in the new filters, and a
+    # species not in display.SPECIES can shift the bits of the ones after it.
+    if (
+        previous is None
+        or _payload_area(previous) != _payload_area(payload)
+        or _layout_signature(previous) != _layout_signature(payload)
+    ):
+        return payload
+    changed = [
+        [number, cell[0], cell[2]]
+        for number, (before_section, section) in enumerate(zip(previous["sections"], payload["sections"]))
+        for before, cell in zip(before_section["cells"], section["cells"])
+        if _masks(before[2]) != _masks(cell[2])
+        or _decoded_animals(before[2], previous) != _decoded_animals(cell[2], payload)
+    ]
+    dictionaries = {name: payload[name] for name in [*DICTIONARY_FIELDS.values(), "filters"]}
+    return {"key": payload["key"], "base": previous["key"], "patch": changed, **dictionaries}
+
+
+# Export column -> label for the kennel drill-down, in display order
+DETAIL_FIELDS = {
+    "AnimalNumber": "Animal #",
+    "Species": "Species",
+    "PrimaryBreed": "Breed",
+    "SecondaryBreed": "Secondary breed",
+    "Sex": "Sex",
+    "Age": "Age",
+    "DateOfBirth": "Date of birth",
+    "AnimalWeight": "Weight",
+    "Color": "Color",
+    "ColorPattern": "Pattern",
+    "SpayedNeutered": "Spayed/neutered",
+    "Declawed": "Declawed",
+    "IntakeType": "Intake type",
+    "IntakeDateTime": "Intake",
+    "LOSInDays": "LOS (days)",
+    "Stage": "Stage",
+    "StageChangeReason": "Stage reason",
+    "HoldReason": "Hold reason",
+    "HoldStartDate": "Hold start",
+    "HoldPlacedBy": "Hold placed by",
+    "HorForName": "Hold for",
+    "Danger": "Danger",
+    "DangerType": "Danger type",
+    "ChipNumber": "Chip #",
+    "ARN": "ARN",
+}
+BLANK_DETAILS = {"", "nan", "N/A"}
+
+
+def kennel_details(area, index, details_df, section_number, label):
+    # Full export records for one kennel of an area, looked up on demand:
+    # [{"name": ..., "fields": [[label, value], ...]}, ...]. details_df is
+    # the inventory read with DETAIL_FIELDS' columns, row for row the frame
+    # the kennel index was built from.
+    section = area["sections"][section_number]
+    if section["occupied_only"]:
+        positions = next((found for name, found in _occupied_cells(section, index) if name == label), [])
+    else:
+        cell = next((cell for cell in section["cells"] if cell["label"] == label), None)
+        positions = kennel_positions(index, cell["location"], cell["sublocations"]) if cell else []
+
+    animals = []
+    for record in details_df.iloc[positions].astype(str).to_dict("records"):
+        fields = [
+            [name, record[column].strip()] for column, name in DETAIL_FIELDS.items()
+            if column in record and record[column].strip() not in BLANK_DETAILS
+        ]
+        animals.append({"name": record.get("AnimalName", ""), "fields": fields})
+    return animals
+
+
+def render_mode(environ):
+    mode = environ.get(RENDER_MODE_VARIABLE, RENDER_MODES[0]).strip().lower()
+    if mode not in RENDER_MODES:
+        raise ValueError(f"{RENDER_MODE_VARIABLE} must be one of {', '.join(RENDER_MODES)}, not {mode!r}")
+    return mode
+
+
+if __name__ == "__main__":
+    # Render every area against the current inventory and report the time
+    import time
+
+    from assets import build_assets
+    from data_loader import read_inventory
+    from display import display_keys
+    from kennel_index import build_kennel_index
+
+    animal_df = read_inventory("AnimalInventory.csv")
+    index = build_kennel_index(animal_df)
+    lines = animal_df["AnimalName"].astype(str).tolist()
+    keys = display_keys(animal_df, {}).tolist()
+    compiled = compile_areas(read_area_registry())
+    asset_urls = {kind: "static/" + name for kind, name in build_assets().items()}
+    for name, area in compiled.items():
+        start = time.perf_counter()
+        page = render_area_page(area, index, lines, keys, asset_urls)
+        print(f"{name:<30} {len(page):>8} bytes {1000 * (time.perf_counter() - start):7.2f} ms")
@@ -0,0 +1,103 @@
+import glob
+import hashlib
+import os
+import re
+
+import streamlit.components.v1 as components
+
+# The area maps' stylesheet and scripts are edited in assets/ and served,
+# minified, from static/. Each area iframe links them instead of inlining
+# them. The content hash is part of the file name, so the browser can keep a
+# version cached for as long as it likes and picks up a new one by name.
+# static/index.html (built from area.html, never cached) is the page of the
+# client-side renderer used by ROUNDS_RENDER_MODE=json. static/ is a build
+# output, rebuilt by the app at startup and kept out of git.
+SOURCE_DIR = "assets"
+STATIC_DIR = "static"
+ASSETS = {"css": "area.css", "js": "area.js", "client": "area_client.js"}
+PAGE_SOURCE = "area.html"
+PAGE_NAME = "index.html"
+VERSION_LENGTH = 10
+
+
+def minify_css(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r"\s*([{}:;,])\s*", r"\1", text).replace(";}", "}").strip()
+
+
+def _strip_line_comment(line):
+    # Cut at the first // that isn't inside a string literal
+    for match in re.finditer(r"//", line):
+        before = line[:match.start()]
+        if all(before.count(quote) % 2 == 0 for quote in "'\"`"):
+            return before
+    return line
+
+
+def minify_js(text):
+    # Conservative: drop line comments and indentation, keep one statement
+    # per line so automatic semicolon insertion behaves exactly as before
+    lines = []
+    for line in text.splitlines():
+        line = _strip_line_comment(line).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+MINIFIERS = {"css": minify_css, "js": minify_js, "client": minify_js}
+
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    except FileNotFoundError:
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def build_assets(source_dir=SOURCE_DIR, static_dir=STATIC_DIR):
+    # Minify each source to static/<name>.<hash>.min.<ext>, removing older
+    # builds of it, point static/index.html at them and return kind -> built
+    # file name
+    os.makedirs(static_dir, exist_ok=True)
+    files = {}
+    for kind, name in ASSETS.items():
+        with open(os.path.join(source_dir, name), encoding="utf-8") as f:
+            minified = MINIFIERS[kind](f.read())
+        root, ext = os.path.splitext(name)
+        version = hashlib.md5(minified.encode()).hexdigest()[:VERSION_LENGTH]
+        built = f"{root}.{version}.min{ext}"
+        for old in glob.glob(os.path.join(static_dir, f"{root}.*.min{ext}")):
+            if os.path.basename(old) != built:
+                os.remove(old)
+        target = os.path.join(static_dir, built)
+        if not os.path.exists(target):
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(minified)
+        files[kind] = built
+    with open(os.path.join(source_dir, PAGE_SOURCE), encoding="utf-8") as f:
+        _write_if_changed(os.path.join(static_dir, PAGE_NAME), f.read().format(**files))
+    return files
+
+
+def area_component(static_dir=STATIC_DIR):
+    # static/ is declared as a custom component: its index.html is the json
+    # mode renderer, and Streamlit's component file route serves the assets
+    # with their real content types (the app/static route sends .css/.js as
+    # text/plain with nosniff, which browsers refuse to apply)
+    return components.declare_component("area_map", path=os.path.abspath(static_dir))
+
+
+def asset_base_url(component):
+    # Relative to the app page, which the srcdoc iframes resolve against
+    return f"component/{component.name}/"
+
+
+if __name__ == "__main__":
+    for kind, name in build_assets().items():
+        print(kind, name)
@@ -0,0 +1,77 @@
+// Fit each kennel's animal list to its block: the largest font size in
+// [MIN_FIT, 1]em at which the list doesn't overflow, found by binary search.
+// Every list being fit is searched at once, with one write pass and one read
+// pass per step, so an area costs a handful of reflows rather than one per
+// animal per step. The size is set as --kennel-fit on the list (see
+// area.css). Only kennels that were resized or whose animals changed are
+// refit, batched into the next animation frame. Virtual lists (see
+// area_client.js) have a fixed size and are never fit.
+const MIN_FIT = 0.5;
+const FIT_STEPS = 6;
+
+const dirtyLists = new Set();
+let fitScheduled = false;
+
+function overflows(list) {
+    return list.scrollHeight > list.clientHeight || list.scrollWidth > list.clientWidth;
+}
+
+function setFit(list, size) {
+    list.style.setProperty('--kennel-fit', size + 'em');
+}
+
+function fitLists(lists) {
+    lists.forEach(list => setFit(list, 1));
+    const searches = lists.filter(overflows).map(list => ({list, lo: MIN_FIT, hi: 1}));
+    for (let step = 0; step < FIT_STEPS && searches.length; step++) {
+        searches.forEach(s => setFit(s.list, (s.lo + s.hi) / 2));
+        searches.forEach(s => {
+            const mid = (s.lo + s.hi) / 2;
+            if (overflows(s.list)) s.hi = mid; else s.lo = mid;
+        });
+    }
+    searches.forEach(s => setFit(s.list, s.lo));
+}
+
+function scheduleFit(list) {
+    if (list.classList.contains('kennel-virtual')) return;
+    dirtyLists.add(list);
+    if (fitScheduled) return;
+    fitScheduled = true;
+    requestAnimationFrame(() => {
+        fitScheduled = false;
+        const lists = Array.from(dirtyLists).filter(list => list.isConnected && !list.classList.contains('kennel-virtual'));
+        dirtyLists.clear();
+        fitLists(lists);
+    });
+}
+
+const kennelResizes = new ResizeObserver(entries => {
+    entries.forEach(entry => {
+        const list = entry.target.querySelector('.kennel-animal-list');
+        if (list) scheduleFit(list);
+    });
+});
+
+function observeBlocks(node) {
+    if (node.nodeType !== Node.ELEMENT_NODE) return;
+    if (node.matches('.kennel-block')) kennelResizes.observe(node);
+    node.querySelectorAll('.kennel-block').forEach(block => kennelResizes.observe(block));
+}
+
+const kennelChanges = new MutationObserver(records => {
+    records.forEach(record => {
+        record.addedNodes.forEach(observeBlocks);
+        const target = record.target.nodeType === Node.ELEMENT_NODE ? record.target : record.target.parentElement;
+        const list = target && target.closest('.kennel-animal-list');
+        if (list) scheduleFit(list);
+    });
+});
+
+// Observing a block reports its size once, which does the initial fit
+function observeKennels(root) {
+    observeBlocks(root);
+    kennelChanges.observe(root, {childList: true, subtree: true, characterData: true});
+}
+
+document.addEventListener('DOMContentLoaded', () => observeKennels(document.body));
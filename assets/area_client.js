@@ -0,0 +1,301 @@
+// Client-side renderer for ROUNDS_RENDER_MODE=json. The server sends one
+// compact payload per area (area_layouts.area_payload): the layout with each
+// kennel as [label, placement, animals], and each animal as a
+// [number, name, stage, hold, date, mask] row where stage, hold and date are
+// codes into the payload's stages / holds / dates lists (-1 for none) and
+// mask's bits are the payload's filters. The kennel lines are built here,
+// mirroring display.build_display_lines.
+//
+// After a refresh the server sends only a patch (area_layouts.payload_patch):
+// the kennels whose animals changed, keyed by section number and label.
+// Those lists are swapped in place, so every other kennel keeps its nodes,
+// its fitted font size and the scroll position. A patch that doesn't apply
+// to what is shown (the iframe was recreated) asks the server for the whole
+// payload instead.
+//
+// Each animal also carries a filter bitmask, whose bits are payload.filters
+// ([group, label]: any hold, the hold classes, then species). The toggles above the map
+// filter entirely in the browser: within a group any selected toggle
+// matches, across groups all must, and a group with nothing selected doesn't
+// filter. Animals that don't match are dimmed, so kennels keep their layout.
+//
+// A kennel with more than VIRTUAL_THRESHOLD animals gets a virtual list
+// instead: rows of one fixed height at VIRTUAL_FIT (the fitting in area.js
+// skips it), of which only the ones scrolled into view, plus a few either
+// side, are in the DOM, and a badge with the count. However full a kennel
+// gets, it costs a screenful of nodes and no fitting.
+//
+// Clicking a kennel asks the server for its animals' full export records
+// (area_layouts.kennel_details) through the component value. They arrive in
+// the separate `details` argument and open in a side panel, so the payload
+// itself never carries them.
+//
+// Talks to Streamlit's component protocol directly, so there is no build
+// step.
+const PETPOINT_ANIMAL_URL = 'https://sms.petpoint.com/sms3/enhanced/animal/';
+const VIRTUAL_THRESHOLD = 12;
+const VIRTUAL_FIT = 0.8;
+const VIRTUAL_OVERSCAN = 4;
+
+let renderedKey = null;
+let dictionaries = null;
+// "section number:label" -> that kennel's .kennel-animal-list
+const kennelLists = new Map();
+// "group:label" of the selected filter toggles, and per group the OR of
+// their bits
+const activeFilters = new Set();
+let filterMasks = [];
+// Virtual .kennel-animal-list -> {animals, dictionaries}: the payload its
+// codes came from, since a later patch replaces the shared dictionaries
+// without resending kennels whose animals didn't change
+const virtualLists = new Map();
+// The details request the panel is waiting for: {at, label}
+let pendingDetails = null;
+
+function sendToStreamlit(type, data) {
+    window.parent.postMessage(Object.assign({isStreamlitMessage: true, type: type}, data), '*');
+}
+
+function element(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+}
+
+// Python's str.title: upper-case the first letter of every run of letters
+function titleCase(text) {
+    return text.toLowerCase().replace(/(^|[^\p{L}])(\p{L})/gu, (match, before, letter) => before + letter.toUpperCase());
+}
+
+function animalLine(animal, codes = dictionaries) {
+    const [number, name, stage, hold, date, mask] = animal;
+    const line = element('div', 'kennel-animal');
+    line.dataset.mask = mask;
+    applyFilter(line);
+    const unnamed = name.toLowerCase() === 'nan' || name.trim() === '';
+    const shown = titleCase(unnamed ? number.slice(-8) : name);
+    const petpointId = number.replace(/\D/g, '');
+    if (petpointId) {
+        const link = element('a', null, shown);
+        link.href = PETPOINT_ANIMAL_URL + petpointId;
+        link.target = '_blank';
+        line.append(link);
+    } else {
+        line.append(shown);
+    }
+    const abbr = stage >= 0 ? codes.stages[stage] : '';
+    if (abbr) {
+        line.append(' ', element('span', 'stage-abbr', abbr));
+        const clearDate = date >= 0 ? codes.dates[date] : '';
+        if (clearDate) line.append(' ', element('span', 'clear-date', clearDate));
+    }
+    return line;
+}
+
+function animalLines(animals) {
+    if (!animals.length) return [element('div', 'kennel-animal', '-')];
+    return animals.map(animal => animalLine(animal));
+}
+
+// Render the rows of a virtual list that are in view
+function showVisibleRows(list) {
+    const {animals, dictionaries: codes} = virtualLists.get(list);
+    const rows = list.firstChild;
+    const rowHeight = rows.offsetHeight / animals.length;
+    if (!rowHeight) return;
+    const first = Math.max(0, Math.floor(list.scrollTop / rowHeight) - VIRTUAL_OVERSCAN);
+    const last = Math.min(animals.length, Math.ceil((list.scrollTop + list.clientHeight) / rowHeight) + VIRTUAL_OVERSCAN);
+    if (rows.dataset.first === String(first) && rows.dataset.last === String(last)) return;
+    rows.dataset.first = first;
+    rows.dataset.last = last;
+    rows.replaceChildren(...animals.slice(first, last).map((animal, offset) => {
+        const line = animalLine(animal, codes);
+        line.style.setProperty('--row', first + offset);
+        return line;
+    }));
+}
+
+// Observing a list reports its size once it is laid out, which does the
+// first render
+const virtualResizes = new ResizeObserver(entries => {
+    entries.forEach(entry => {
+        if (virtualLists.has(entry.target)) showVisibleRows(entry.target);
+    });
+});
+
+function fillList(list, animals) {
+    const block = list.parentNode;
+    const badge = block.querySelector('.kennel-count');
+    if (badge) badge.remove();
+    virtualLists.delete(list);
+    virtualResizes.unobserve(list);
+    const virtual = animals.length > VIRTUAL_THRESHOLD;
+    list.classList.toggle('kennel-virtual', virtual);
+    if (!virtual) {
+        list.replaceChildren(...animalLines(animals));
+        return;
+    }
+    list.style.setProperty('--kennel-fit', VIRTUAL_FIT + 'em');
+    const rows = element('div', 'kennel-virtual-rows');
+    rows.style.setProperty('--rows', animals.length);
+    list.replaceChildren(rows);
+    block.append(element('div', 'kennel-count', animals.length));
+    virtualLists.set(list, {animals, dictionaries});
+    virtualResizes.observe(list);
+}
+
+function kennelBlock(cell, sectionNumber) {
+    const [label, placement, animals] = cell;
+    const block = element('div', 'kennel-block');
+    block.style.cssText = placement;
+    block.dataset.section = sectionNumber;
+    block.dataset.label = label;
+    const list = element('div', 'kennel-animal-list');
+    list.addEventListener('scroll', () => {
+        if (virtualLists.has(list)) showVisibleRows(list);
+    }, {passive: true});
+    kennelLists.set(sectionNumber + ':' + label, list);
+    block.append(element('div', 'kennel-label-small', label), list);
+    fillList(list, animals);
+    return block;
+}
+
+function applyFilter(line) {
+    const mask = Number(line.dataset.mask);
+    line.classList.toggle('filtered-out', !filterMasks.every(groupMask => mask & groupMask));
+}
+
+function applyFilters() {
+    const masks = new Map();
+    dictionaries.filters.forEach(([group, label], bit) => {
+        if (activeFilters.has(group + ':' + label)) masks.set(group, (masks.get(group) || 0) | (1 << bit));
+    });
+    filterMasks = Array.from(masks.values());
+    document.querySelectorAll('.kennel-animal[data-mask]').forEach(applyFilter);
+}
+
+function filterBar() {
+    const bar = element('div', 'area-filters');
+    let currentGroup = null;
+    dictionaries.filters.forEach(([group, label]) => {
+        if (group !== currentGroup) {
+            currentGroup = group;
+            bar.append(element('span', 'area-filter-group', group));
+        }
+        const key = group + ':' + label;
+        const toggle = element('button', 'area-filter', label);
+        toggle.classList.toggle('active', activeFilters.has(key));
+        toggle.addEventListener('click', () => {
+            if (activeFilters.has(key)) activeFilters.delete(key); else activeFilters.add(key);
+            toggle.classList.toggle('active', activeFilters.has(key));
+            applyFilters();
+        });
+        bar.append(toggle);
+    });
+    return bar;
+}
+
+function renderArea(payload) {
+    kennelLists.clear();
+    virtualLists.forEach((virtual, list) => virtualResizes.unobserve(list));
+    virtualLists.clear();
+    const map = element('div', 'area-map');
+    map.style.cssText = payload.style;
+    payload.sections.forEach((section, sectionNumber) => {
+        const sectionNode = element('div', 'area-section');
+        sectionNode.style.cssText = section.placement;
+        if (section.heading) sectionNode.append(element('div', 'area-heading', section.heading));
+        const grid = element('div', 'area-grid');
+        grid.style.cssText = section.grid;
+        section.cells.forEach(cell => grid.append(kennelBlock(cell, sectionNumber)));
+        sectionNode.append(grid);
+        map.append(sectionNode);
+    });
+    document.body.replaceChildren(filterBar(), map);
+}
+
+function patchArea(patch) {
+    patch.forEach(([sectionNumber, label, animals]) => {
+        fillList(kennelLists.get(sectionNumber + ':' + label), animals);
+    });
+}
+
+function detailsPanel(title, animals) {
+    const panel = element('div', 'kennel-details');
+    const close = element('button', 'kennel-details-close', '\u00d7');
+    close.addEventListener('click', closeDetails);
+    panel.append(close, element('h3', null, title));
+    if (!animals) {
+        panel.append(element('p', null, 'Loading\u2026'));
+    } else if (!animals.length) {
+        panel.append(element('p', null, 'No animals'));
+    }
+    (animals || []).forEach(animal => {
+        panel.append(element('h4', null, titleCase(animal.name)));
+        const fields = element('dl');
+        animal.fields.forEach(([label, value]) => fields.append(element('dt', null, label), element('dd', null, value)));
+        panel.append(fields);
+    });
+    return panel;
+}
+
+function showDetails(panel) {
+    const open = document.querySelector('.kennel-details');
+    if (open) open.replaceWith(panel); else document.body.append(panel);
+}
+
+function closeDetails() {
+    pendingDetails = null;
+    const open = document.querySelector('.kennel-details');
+    if (open) open.remove();
+}
+
+document.addEventListener('click', event => {
+    if (event.target.closest('a, .kennel-details')) return;
+    const block = event.target.closest('.kennel-block');
+    if (!block) return;
+    pendingDetails = {at: Date.now(), label: block.dataset.label};
+    showDetails(detailsPanel(pendingDetails.label, null));
+    sendToStreamlit('streamlit:setComponentValue', {
+        value: {details: [Number(block.dataset.section), pendingDetails.label], key: renderedKey, at: pendingDetails.at},
+        dataType: 'json',
+    });
+});
+
+function receiveDetails(details) {
+    if (!details || !pendingDetails || details.id !== pendingDetails.at) return;
+    showDetails(detailsPanel(pendingDetails.label, details.animals));
+}
+
+window.addEventListener('message', event => {
+    if (!event.data || event.data.type !== 'streamlit:render') return;
+    receiveDetails(event.data.args.details);
+    const payload = event.data.args.payload;
+    // Reruns resend the same payload; only a new area or data version renders
+    if (!payload || payload.key === renderedKey) return;
+    if (payload.patch && payload.base !== renderedKey) {
+        // A fresh value each time (the iframe may be new), so it reruns
+        sendToStreamlit('streamlit:setComponentValue', {value: {resync: Date.now()}, dataType: 'json'});
+        return;
+    }
+    dictionaries = payload;
+    if (payload.patch) {
+        // A species new to display.SPECIES adds a toggle; kennels whose masks
+        // it renumbered are in the patch
+        document.querySelector('.area-filters').replaceWith(filterBar());
+        patchArea(payload.patch);
+    } else {
+        closeDetails();
+        renderArea(payload);
+    }
+    applyFilters();
+    renderedKey = payload.key;
+});
+
+// Size the iframe to the map instead of a fixed height
+new ResizeObserver(() => {
+    sendToStreamlit('streamlit:setFrameHeight', {height: document.documentElement.scrollHeight});
+}).observe(document.documentElement);
+
+sendToStreamlit('streamlit:componentReady', {apiVersion: 1});
@@ -0,0 +1,111 @@
+import pandas as pd
+
+from dates import DATE_FORMAT, parse_dates
+from display import UNKNOWN_CLEAR_DATE
+from stages import hold_classes
+
+REPORT_COLUMNS = ["AnimalNumber", "AnimalName", "Stage", "ClearDate"]
+# Columns of the clear-date editor, indexed by AnimalNumber
+GRID_COLUMNS = ["Name", "Hold", "Location", "ClearDate", "Source"]
+
+# Default hold lengths: HoldClass,Species,Days, where a blank Species is the
+# length for every species without a row of its own. A hold class without
+# any row gets no automatic date.
+HOLD_RULES_PATH = "hold_rules.csv"
+RULE_KEYS = ["HoldClass", "Species"]
+
+
+def reconcile_clear_dates(animal_df, clear_dates, stored_df=None):
+    # One outer join of the animals on hold against their clear dates:
+    #   missing     - on hold, but no (or a blank) clear date
+    #   stale       - has a clear date, but the animal is no longer on hold
+    #   unparseable - on hold with a clear date we can't read as a date
+    # Animals not in the inventory take their name and stage from stored_df
+    # (the clear-date store's frame), when given.
+    holds = animal_df.loc[animal_df["HoldClass"] != "", ["AnimalNumber", "AnimalName", "Stage"]]
+    clear_df = pd.DataFrame(
+        {"AnimalNumber": list(clear_dates.keys()), "ClearDate": list(clear_dates.values())},
+        dtype=object,
+    )
+    merged = holds.astype({"Stage": str}).merge(clear_df, on="AnimalNumber", how="outer", indicator=True, sort=False)
+    merged["ClearDate"] = merged["ClearDate"].fillna("").astype(str).str.strip()
+    if stored_df is not None:
+        stored = stored_df.set_index("AnimalNumber")
+        for column in ["AnimalName", "Stage"]:
+            merged[column] = merged[column].fillna(merged["AnimalNumber"].map(stored[column]))
+    merged[["AnimalName", "Stage"]] = merged[["AnimalName", "Stage"]].fillna("")
+
+    on_hold = merged["_merge"] != "right_only"
+    blank = merged["ClearDate"] == ""
+    unreadable = parse_dates(merged["ClearDate"]).isna() & ~blank & (merged["ClearDate"].str.upper() != "UNK")
+    return {
+        "missing": merged.loc[on_hold & blank, REPORT_COLUMNS].reset_index(drop=True),
+        "stale": merged.loc[~on_hold, REPORT_COLUMNS].reset_index(drop=True),
+        "unparseable": merged.loc[on_hold & unreadable, REPORT_COLUMNS].reset_index(drop=True),
+    }
+
+
+def read_hold_rules(path=HOLD_RULES_PATH):
+    rules = pd.read_csv(path, dtype=str, keep_default_na=False)
+    rules.columns = [c.strip() for c in rules.columns]
+    rules[RULE_KEYS] = rules[RULE_KEYS].apply(lambda column: column.str.strip())
+    rules["Days"] = pd.to_numeric(rules["Days"], errors="coerce")
+    # The last row for a (hold class, species) wins
+    return rules.dropna(subset=["Days"]).drop_duplicates(RULE_KEYS, keep="last")[[*RULE_KEYS, "Days"]]
+
+
+def rule_clear_dates(animal_df, rules):
+    # Default clear dates for every hold in one pass: the hold's start plus
+    # the rule's days for its class and species (or the class's blank-species
+    # rule). A hold whose HoldStartDate is blank or unreadable gets no date
+    # (the intake date is no stand-in: a bite hold can start weeks later),
+    # so it stays UNK and reported missing. Returns AnimalNumber -> mm/dd/yy
+    # for the holds a rule dated.
+    keys = pd.DataFrame({
+        "HoldClass": hold_classes(animal_df["Stage"]).astype(str).to_numpy(),
+        "Species": animal_df["AnimalType"].astype(str).str.strip().to_numpy(),
+    })
+    days = keys.merge(rules, on=RULE_KEYS, how="left")["Days"]
+    days = days.fillna(keys.assign(Species="").merge(rules, on=RULE_KEYS, how="left")["Days"])
+    start = parse_dates(animal_df["HoldStartDate"])
+    dates = pd.Series(start.to_numpy() + pd.to_timedelta(days.to_numpy(), unit="D")).dt.strftime(DATE_FORMAT)
+    dated = dates.notna().to_numpy()
+    return dict(zip(animal_df["AnimalNumber"].astype(str)[dated], dates[dated]))
+
+
+def effective_clear_dates(rule_dates, manual_dates):
+    # A clear date entered by hand (or imported from clear.csv) always wins
+    # over the rule's, UNK included; a blank one falls back to it
+    return {**rule_dates, **{number: date for number, date in manual_dates.items() if date}}
+
+
+def clear_date_grid(holds_df, clear_dates, manual_dates):
+    # The clear-date editor's frame: one row per animal on hold, grouped by
+    # hold class in HOLD_CLASSES order, with the clear date parsed (NaT when
+    # blank, UNK or unreadable) so the editor can validate it as a date, and
+    # whether it came from a hold rule or from the store (manual_dates)
+    holds_df = holds_df.sort_values("HoldClass", kind="stable")
+    numbers = holds_df["AnimalNumber"].astype(str)
+    dates = numbers.map(clear_dates).fillna("")
+    manual = numbers.map(manual_dates).fillna("") != ""
+    names = holds_df["AnimalName"].astype(str)
+    unnamed = names.str.lower().eq("nan") | names.str.strip().eq("")
+    return pd.DataFrame({
+        "Name": names.where(~unnamed, "").str.title().to_numpy(),
+        "Hold": holds_df["HoldClass"].astype(str).to_numpy(),
+        "Location": (holds_df["Location_1"].astype(str) + " " + holds_df["SubLocation"].astype(str)).to_numpy(),
+        "ClearDate": parse_dates(dates).to_numpy(),
+        "Source": manual.map({True: "Manual", False: "Rule"}).where(dates != "", "").to_numpy(),
+    }, index=pd.Index(numbers, name="AnimalNumber"))[GRID_COLUMNS]
+
+
+def clear_date_updates(grid, edited, rule_dates):
+    # The editor's changes as one diff, AnimalNumber -> mm/dd/yy, ready for
+    # ClearDateStore.update. A cleared date is stored as UNK where a hold
+    # rule would otherwise date the animal again, else as ""
+    before = grid["ClearDate"]
+    after = pd.to_datetime(edited["ClearDate"].reindex(grid.index))
+    changed = (before != after) & ~(before.isna() & after.isna())
+    numbers = grid.index[changed]
+    cleared = pd.Series(numbers.isin(list(rule_dates)), index=numbers).map({True: UNKNOWN_CLEAR_DATE, False: ""})
+    return dict(zip(numbers, after[changed].dt.strftime(DATE_FORMAT).fillna(cleared)))
@@ -1,35 +1,7 @@
 import csv
 import pandas as pd
-import datetime
-
-# Define the stages we want to filter for
-HOLD_STAGES = [
-    'Hold - Bite/Scratch',
-    'Hold - Legal Notice',
-    'Hold - Stray'
-]
-
-def extract_date(date_str):
-    if pd.isna(date_str) or not date_str:
-        return ''
-    try:
-        # Try to parse the date string with AM/PM
-        for fmt in ("%m/%d/%Y %I:%M %p", "%m/%d/%Y %I:%M%p", "%m/%d/%y %I:%M %p", "%m/%d/%y %I:%M%p"):
-            try:
-                dt = datetime.datetime.strptime(str(date_str), fmt)
-                return dt.strftime("%m/%d/%y")  # Return only the date portion
-            except Exception:
-                continue
-        # If the above formats fail, try date-only formats
-        for fmt in ("%m/%d/%y", "%m/%d/%Y", "%-m/%-d/%y", "%-m/%-d/%Y"):
-            try:
-                dt = datetime.datetime.strptime(str(date_str), fmt)
-                return dt.strftime("%m/%d/%y")
-            except Exception:
-                continue
-        return str(date_str)  # Return original if parsing fails
-    except Exception:
-        return str(date_str)  # Return original if any error occurs
+from dates import normalize_dates
+from stages import hold_classes
 
 def process_inventory():
     try:
@@ -46,7 +18,7 @@ def process_inventory():
         print("StageReview columns:", review_df.columns.tolist())
         
         # Filter for the required stages and select only needed columns
-        filtered_df = df[df['Stage'].isin(HOLD_STAGES)][
+        filtered_df = df[hold_classes(df['Stage']) != ""][
             ['AnimalNumber', 'AnimalName', 'AnimalType', 'Stage']
         ]
         
@@ -65,7 +37,7 @@ def process_inventory():
         filtered_df = filtered_df.drop('textbox89', axis=1)
         
         # Extract only the date from ClearDate
-        filtered_df['ClearDate'] = filtered_df['ClearDate'].apply(extract_date)
+        filtered_df['ClearDate'] = normalize_dates(filtered_df['ClearDate'])
         
         # Write the filtered data to clear.csv
         filtered_df.to_csv('clear.csv', index=False)
@@ -0,0 +1,170 @@
+import atexit
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+
+import pandas as pd
+
+from data_loader import CLEAR_COLUMNS, file_fingerprint, read_clear_file, write_clear_file
+
+# Clear dates shared by every session, kept in SQLite keyed by AnimalNumber.
+# All rows are held in memory, so reads never touch the database; updates
+# change memory at once and are written behind, batched, a moment later.
+# clear.csv is imported whenever its fingerprint changes (the morning pull
+# rewrites it), and can be exported back out. When the inventory changes,
+# the rows of animals no longer on hold are pruned, so the store (and its
+# export) only grows with the holds.
+STORE_PATH = "clear_dates.sqlite"
+FLUSH_DELAY_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clear_dates (
+    AnimalNumber TEXT PRIMARY KEY,
+    AnimalName TEXT NOT NULL DEFAULT '',
+    AnimalType TEXT NOT NULL DEFAULT '',
+    Stage TEXT NOT NULL DEFAULT '',
+    ClearDate TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+UPSERT = (
+    "INSERT INTO clear_dates VALUES (?, ?, ?, ?, ?) ON CONFLICT(AnimalNumber) DO UPDATE SET "
+    "AnimalName = excluded.AnimalName, AnimalType = excluded.AnimalType, "
+    "Stage = excluded.Stage, ClearDate = excluded.ClearDate"
+)
+
+
+class ClearDateStore:
+    def __init__(self, path=STORE_PATH):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        # AnimalNumber -> (AnimalName, AnimalType, Stage, ClearDate)
+        self._rows = {
+            row[0]: row[1:] for row in self._connection.execute("SELECT * FROM clear_dates")
+        }
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+        self._csv_fingerprint = meta.get("csv_fingerprint")
+        self._inventory_fingerprint = meta.get("inventory_fingerprint")
+        self._pending = set()
+        self._flush_timer = None
+        self._publish()
+        atexit.register(self.flush)
+
+    def _publish(self):
+        # A new dates dict per change, never mutated after, so a snapshot can
+        # be handed out without copying; the version is a content hash
+        self._dates = {number: row[3] for number, row in self._rows.items()}
+        self._version = hashlib.md5(repr(sorted(self._rows.items())).encode()).hexdigest()
+
+    def snapshot(self):
+        # (version, AnimalNumber -> clear date), consistent with each other
+        with self._lock:
+            return self._version, self._dates
+
+    def update(self, updates, animal_df):
+        # Set the clear dates in updates (AnimalNumber -> date); an animal
+        # new to the store takes its name, type and stage from animal_df
+        info = animal_df.loc[animal_df["AnimalNumber"].astype(str).isin(updates), CLEAR_COLUMNS[:-1]]
+        info = {row[0]: tuple("" if value == "nan" else value for value in row[1:])
+                for row in info.astype(str).itertuples(index=False)}
+        with self._lock:
+            for number, date in updates.items():
+                details = info.get(number) or self._rows.get(number, ("", "", ""))[:3]
+                self._rows[number] = (*details, date)
+                self._pending.add(number)
+            self._publish()
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        # Write every pending update in one transaction
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            rows = [(number, *self._rows[number]) for number in self._pending]
+            self._pending.clear()
+            if rows:
+                with self._connection:
+                    self._connection.executemany(UPSERT, rows)
+
+    def prune(self, on_hold, fingerprint=None):
+        # Drop every row whose animal isn't in on_hold (AnimalNumbers), along
+        # with any write still pending for it; fingerprint is the inventory
+        # version on_hold came from
+        with self._lock:
+            gone = [number for number in self._rows if number not in on_hold]
+            for number in gone:
+                del self._rows[number]
+                self._pending.discard(number)
+            with self._connection:
+                self._connection.executemany(
+                    "DELETE FROM clear_dates WHERE AnimalNumber = ?", [(number,) for number in gone]
+                )
+                if fingerprint is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('inventory_fingerprint', ?)", (fingerprint,)
+                    )
+            self._inventory_fingerprint = fingerprint
+            if gone:
+                self._publish()
+
+    def prune_if_changed(self, fingerprint, on_hold):
+        # on_hold is only called for a new inventory version
+        if fingerprint != self._inventory_fingerprint:
+            self.prune(on_hold(), fingerprint)
+
+    def import_csv(self, path):
+        # Upsert every row of clear.csv: a date in the file replaces the
+        # stored one, but a blank date doesn't clear one entered here
+        clear_df = read_clear_file(path)
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            rows = []
+            for number, *details, date in clear_df.itertuples(index=False):
+                stored = self._rows.get(number)
+                if not date and stored:
+                    date = stored[3]
+                self._rows[number] = (*details, date)
+                self._pending.discard(number)
+                rows.append((number, *details, date))
+            with self._connection:
+                self._connection.executemany(UPSERT, rows)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('csv_fingerprint', ?)", (fingerprint,)
+                )
+            self._csv_fingerprint = fingerprint
+            self._publish()
+
+    def import_csv_if_changed(self, path):
+        # One stat per call while clear.csv is unchanged
+        if os.path.exists(path) and file_fingerprint(path) != self._csv_fingerprint:
+            self.import_csv(path)
+
+    def frame(self):
+        with self._lock:
+            rows = [(number, *row) for number, row in self._rows.items()]
+        return pd.DataFrame(rows, columns=CLEAR_COLUMNS, dtype=str)
+
+    def export_csv(self, path):
+        # Importing an export back changes nothing, so the version (a
+        # content hash) stays the same and no cache is invalidated
+        write_clear_file(path, self.frame())
+
+
+if __name__ == "__main__":
+    # python clear_store.py import|export [clear.csv]
+    command, csv_path = sys.argv[1], (sys.argv[2] if len(sys.argv) > 2 else "clear.csv")
+    store = ClearDateStore()
+    if command == "import":
+        store.import_csv(csv_path)
+    elif command == "export":
+        store.export_csv(csv_path)
+    else:
+        sys.exit(f"Unknown command {command!r}: use import or export")
+    print(f"{command}ed {len(store.snapshot()[1])} clear dates")
@@ -1,99 +1,112 @@
-import pandas as pd
-import openpyxl
+import csv
+import itertools
 import os
+from collections import deque
 
-def convert_animal_inventory(xlsx_path, csv_path):
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    ws = wb.worksheets[1]  # 2nd tab
-    data = list(ws.values)
-    print(f"Total rows in Excel: {len(data)}")
-
-    # Find the header row in the CSV (from your sample)
-    csv_header = [
-        'Location_1','AVG_LOS','Distinct_Animals','AnimalNumber','AnimalName','AnimalType','PrimaryBreed','Age','Color','Declawed','PreAltered','IntakeType','Sex','Stage','Location','ARN','ChipNumber','Species','SecondaryBreed','DateOfBirth','ColorPattern','EmancipationDate','SpayedNeutered','IntakeDateTime','LOSInDays','StageChangeReason','SubLocation','AnimalWeight','Danger','DangerType','NumberOfPictures','Videos','HoldReason','HorForName','HoldStartDate','HoldPlacedBy','Total_Animals'
-    ]
-    output_rows = [csv_header]
-
-    i = 0
-    current_loc1 = current_los = current_count = None
-    while i < len(data):
-        row = data[i]
-        # Print first few rows for debugging
-        if i < 10:
-            print(f"Row {i}: {row}")
-            
-        # Detect group header: first 3 columns are not empty, rest are empty or None
-        if row[0] and row[1] and row[2] and all((x is None or x == '') for x in row[3:]):
-            print(f"Found group header at row {i}: {row[0]}, {row[1]}, {row[2]}")
-            current_loc1, current_los, current_count = row[0], row[1], row[2]
-            i += 1
-            continue
-            
-        # Only process animal rows if group header is set
-        if current_loc1 is not None and i+2 < len(data):
-            animal_rows = data[i:i+3]
-            print(f"Processing animal rows starting at {i}:")
-            for r in animal_rows:
-                print(f"  {r}")
-            flat = []
-            for r in animal_rows:
-                flat.extend([x if x is not None else '' for x in r])
-            out_row = [current_loc1, current_los, current_count] + flat
-            out_row = out_row[:len(csv_header)] + ['']*(len(csv_header)-len(out_row))
-            output_rows.append(out_row)
-            i += 3
+import openpyxl
+
+# PetPoint's xlsx reports -> the CSVs the dashboard and clear_file.py read.
+# Workbooks are opened read-only and streamed a row at a time through a small
+# state machine per report, and each record goes straight to a csv.writer,
+# so memory stays flat however large the export gets.
+
+INVENTORY_HEADER = [
+    'Location_1','AVG_LOS','Distinct_Animals','AnimalNumber','AnimalName','AnimalType','PrimaryBreed','Age','Color','Declawed','PreAltered','IntakeType','Sex','Stage','Location','ARN','ChipNumber','Species','SecondaryBreed','DateOfBirth','ColorPattern','EmancipationDate','SpayedNeutered','IntakeDateTime','LOSInDays','StageChangeReason','SubLocation','AnimalWeight','Danger','DangerType','NumberOfPictures','Videos','HoldReason','HorForName','HoldStartDate','HoldPlacedBy','Total_Animals'
+]
+STAGE_REVIEW_HEADER = [
+    'Location','textbox39','textbox89','AnimalName','Species','PrimaryBreed','textbox90','PrimaryColour','Stage','ReviewDate','StageChangeReason','ARN','textbox61','textbox78','SecondaryBreed','Gender','SecondaryColour','textbox79','SubLocation','HoldReason','HorForName','HoldStartDate','HoldPlacedBy','textbox47'
+]
+# Rows per animal record, and how many of them hold data
+INVENTORY_RECORD_ROWS = 3
+STAGE_REVIEW_RECORD_ROWS, STAGE_REVIEW_DATA_ROWS = 3, 2
+STAGE_REVIEW_HEADER_ROWS = 2
+
+
+def _sheet_rows(ws):
+    # Rows as value tuples, all padded to the width of the widest row, as a
+    # fully loaded sheet has them (records span rows, so a short row would
+    # shift the cells after it). PetPoint's exports don't record their size,
+    # and a recorded one can count trailing empty cells, so the width is
+    # found with one extra streaming pass.
+    ws.reset_dimensions()
+    ws.calculate_dimension(force=True)
+    return ws.iter_rows(max_col=ws.max_column, values_only=True)
+
+
+def _flatten(rows, width):
+    # Concatenate rows (None -> ''), cut or padded to width
+    flat = [x if x is not None else '' for row in rows for x in row][:width]
+    return flat + [''] * (width - len(flat))
+
+
+def _is_group_header(row):
+    # Location, average LOS and animal count, the rest empty
+    return bool(row[0] and row[1] and row[2]) and all((x is None or x == '') for x in row[3:])
+
+
+def inventory_records(rows):
+    # State: the current location group. Until the first group header, rows
+    # are skipped; after it, every row that isn't a header starts a 3-row
+    # animal record, written as the group's columns plus the record's cells.
+    # A record cut short by the end of the sheet is dropped.
+    group = None
+    rows = iter(rows)
+    for row in rows:
+        if _is_group_header(row):
+            group = list(row[:3])
+        elif group is not None:
+            record = [row, *itertools.islice(rows, INVENTORY_RECORD_ROWS - 1)]
+            if len(record) < INVENTORY_RECORD_ROWS:
+                return
+            yield _flatten([group, *record], len(INVENTORY_HEADER))
+
+
+def stage_review_records(rows):
+    # Looks at most a record ahead: a row with a first cell followed by
+    # another one is a 2-row group header; anything else starts a 3-row
+    # animal record whose first 2 rows are written. Fewer than a record's
+    # rows left ends the report.
+    window = deque()
+    rows = iter(rows)
+    while True:
+        window.extend(itertools.islice(rows, STAGE_REVIEW_RECORD_ROWS - len(window)))
+        if len(window) < STAGE_REVIEW_RECORD_ROWS:
+            return
+        if window[0][0] and window[1][0] is not None:
+            consumed = STAGE_REVIEW_HEADER_ROWS
         else:
-            i += 1
-            
-    print(f"Total output rows (including header): {len(output_rows)}")
-    # Write to CSV
-    pd.DataFrame(output_rows[1:], columns=output_rows[0]).to_csv(csv_path, index=False)
-    print(f"Converted {xlsx_path} to {csv_path}")
+            yield _flatten(itertools.islice(window, STAGE_REVIEW_DATA_ROWS), len(STAGE_REVIEW_HEADER))
+            consumed = STAGE_REVIEW_RECORD_ROWS
+        for _ in range(consumed):
+            window.popleft()
+
+
+def _convert(xlsx_path, csv_path, header, records):
+    # Stream the 2nd tab through records into csv_path; returns the number
+    # of animals written
+    wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(header)
+            count = 0
+            for count, record in enumerate(records(_sheet_rows(wb.worksheets[1])), 1):
+                writer.writerow(record)
+    finally:
+        wb.close()
+    return count
+
+
+def convert_animal_inventory(xlsx_path, csv_path):
+    count = _convert(xlsx_path, csv_path, INVENTORY_HEADER, inventory_records)
+    print(f"Converted {xlsx_path} to {csv_path}: {count} animals")
+
 
 def convert_stage_review(xlsx_path, csv_path):
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    ws = wb.worksheets[1]  # 2nd tab
-    data = list(ws.values)
-    print(f"Total rows in Stage Review Excel: {len(data)}")
-
-    # Find the header row in the CSV (from your sample)
-    csv_header = [
-        'Location','textbox39','textbox89','AnimalName','Species','PrimaryBreed','textbox90','PrimaryColour','Stage','ReviewDate','StageChangeReason','ARN','textbox61','textbox78','SecondaryBreed','Gender','SecondaryColour','textbox79','SubLocation','HoldReason','HorForName','HoldStartDate','HoldPlacedBy','textbox47'
-    ]
-    output_rows = [csv_header]
-
-    i = 0
-    while i < len(data):
-        row = data[i]
-        # Print first few rows for debugging
-        if i < 10:
-            print(f"Stage Review Row {i}: {row}")
-            
-        # Detect group header: 2 header rows, then 3 rows per animal (skip 3rd row)
-        if row[0] and (i+2 < len(data)) and (data[i+1][0] is not None):
-            print(f"Found stage review header at row {i}")
-            i += 2
-            continue
-        if i+2 < len(data):
-            animal_rows = data[i:i+2]
-            print(f"Processing stage review animal rows starting at {i}:")
-            for r in animal_rows:
-                print(f"  {r}")
-            flat = []
-            for r in animal_rows:
-                flat.extend([x if x is not None else '' for x in r])
-            out_row = flat[:len(csv_header)] + ['']*(len(csv_header)-len(flat))
-            output_rows.append(out_row)
-            i += 3
-        else:
-            i += 1
-            
-    print(f"Total stage review output rows (including header): {len(output_rows)}")
-    # Write to CSV
-    pd.DataFrame(output_rows[1:], columns=output_rows[0]).to_csv(csv_path, index=False)
-    print(f"Converted {xlsx_path} to {csv_path}")
+    count = _convert(xlsx_path, csv_path, STAGE_REVIEW_HEADER, stage_review_records)
+    print(f"Converted {xlsx_path} to {csv_path}: {count} animals")
 
 if __name__ == "__main__":
     base = os.path.dirname(os.path.abspath(__file__))
     convert_animal_inventory(os.path.join(base, 'AnimalInventory.xlsx'), os.path.join(base, 'AnimalInventory.csv'))
-    convert_stage_review(os.path.join(base, 'StageReview.xlsx'), os.path.join(base, 'StageReview.csv')) 
\ No newline at end of file
+    convert_stage_review(os.path.join(base, 'StageReview.xlsx'), os.path.join(base, 'StageReview.csv'))
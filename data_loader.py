@@ -0,0 +1,115 @@
+import csv
+import hashlib
+import io
+import os
+import time
+
+import pandas as pd
+
+from dates import normalize_dates
+
+# A file modified this recently may still be mid-write, or rewritten again
+# within the filesystem's mtime resolution without changing size, so its
+# stat alone can't tell two versions apart.
+RACY_WINDOW_SECONDS = 2.0
+CHUNK_SIZE = 1 << 20
+PREAMBLE_MAX_LINES = 10
+
+# Only the columns the dashboard reads (HoldStartDate for the hold rules in
+# clear_dates.py); low-cardinality ones are categorical
+INVENTORY_COLUMNS = [
+    "Location_1", "AnimalNumber", "AnimalName", "AnimalType", "Stage", "SubLocation", "HoldStartDate",
+]
+CATEGORY_COLUMNS = ["Stage", "Location_1", "SubLocation", "AnimalType"]
+# clear.csv, as clear_file.py writes it
+CLEAR_COLUMNS = ["AnimalNumber", "AnimalName", "AnimalType", "Stage", "ClearDate"]
+
+# path -> (stat key, content digest, time the digest was taken)
+_fingerprints = {}
+
+
+def _stream_hash(path):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    # Stat first and only re-hash (in chunks) when the stat changed or was
+    # too fresh to trust, so an unchanged file costs one os.stat per rerun.
+    # The digest is the fingerprint, so touching a file doesn't invalidate.
+    path = os.fspath(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _fingerprints.pop(path, None)
+        return None
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == stat_key and cached[2] - stat.st_mtime >= RACY_WINDOW_SECONDS:
+        return cached[1]
+    digest = _stream_hash(path)
+    _fingerprints[path] = (stat_key, digest, time.time())
+    return digest
+
+
+def combine_fingerprints(fingerprints):
+    return hashlib.md5("|".join(str(fp) for fp in fingerprints).encode()).hexdigest()
+
+
+def read_inventory(path, columns=INVENTORY_COLUMNS):
+    # The PetPoint export starts with a BOM and a report-parameter preamble;
+    # skip to the real header and parse the rest from the same handle, reading
+    # only the columns asked for (by default, the ones the map uses). Rows
+    # come back in file order whichever columns are read.
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        header = None
+        for _ in range(PREAMBLE_MAX_LINES):
+            fields = next(csv.reader([f.readline()]), [])
+            if "AnimalNumber" in fields:
+                header = fields
+                break
+        if header is None:
+            raise ValueError(f"No inventory header found in the first {PREAMBLE_MAX_LINES} lines of {path}")
+        animal_df = pd.read_csv(
+            f, header=None, names=header,
+            usecols=[c for c in columns if c in header], dtype=str,
+        )
+
+    for col in ["AnimalName", "Stage", "Location_1", "SubLocation"]:
+        if col in animal_df.columns:
+            animal_df[col] = animal_df[col].astype(str).str.strip()
+    for col in CATEGORY_COLUMNS:
+        if col in animal_df.columns:
+            animal_df[col] = animal_df[col].astype("category")
+    return animal_df
+
+
+def read_clear_file(path):
+    # clear.csv as a frame of CLEAR_COLUMNS (missing ones blank) with the
+    # clear dates normalized. Read the bytes once and pick the encoding from
+    # them, instead of re-reading the file when utf-8 fails.
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = raw.decode("latin1")
+    clear_df = pd.read_csv(io.StringIO(text), dtype=str, on_bad_lines='skip')
+    clear_df.columns = [c.strip() for c in clear_df.columns]
+    clear_df['AnimalNumber'] = clear_df['AnimalNumber'].astype(str)
+    for column in CLEAR_COLUMNS:
+        if column not in clear_df.columns:
+            clear_df[column] = ""
+    clear_df['ClearDate'] = normalize_dates(clear_df['ClearDate'])
+    return clear_df[CLEAR_COLUMNS].fillna("")
+
+
+def write_clear_file(path, clear_df):
+    # Written to a temporary file and swapped in, so a reader never sees
+    # half a file
+    temporary = f"{path}.tmp"
+    clear_df.to_csv(temporary, index=False, columns=CLEAR_COLUMNS)
+    os.replace(temporary, path)
@@ -0,0 +1,62 @@
+import pandas as pd
+
+# Shared clear-date normalization for the dashboard and clear_file.py.
+# Handles Excel serial numbers (e.g. 45814), PetPoint date-times
+# ("6/6/2025 8:33 AM", "4/9/2016 12:00:00 AM") and date-only strings
+# ("06/06/25", "6/6/2025"), and always outputs mm/dd/yy.
+
+DATE_FORMAT = "%m/%d/%y"
+EXCEL_EPOCH = pd.Timestamp(1899, 12, 30)
+
+# m/d/y with a 2 or 4 digit year and an optional h:mm[:ss] AM/PM time
+DATE_PATTERN = (
+    r"^(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4}|\d{2})"
+    r"(?:\s+\d{1,2}:\d{2}(?::\d{2})?\s*[AaPp][Mm])?$"
+)
+
+# Serial day numbers outside this range are not dates we'd ever see
+EXCEL_SERIAL_RANGE = (1, 100000)
+BLANK_VALUES = ["", "NAN", "NONE", "NAT"]
+MEMO_LIMIT = 10000
+
+# raw value -> normalized string, shared across reruns
+_normalized = {}
+
+
+def parse_dates(values):
+    # Series of raw values -> Series of Timestamps (NaT where unparseable)
+    text = pd.Series(values, dtype=object).astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+
+    serials = pd.to_numeric(text, errors="coerce")
+    is_serial = serials.between(*EXCEL_SERIAL_RANGE)
+    if is_serial.any():
+        parsed[is_serial] = EXCEL_EPOCH + pd.to_timedelta(serials[is_serial], unit="D")
+
+    parts = text[~is_serial].str.extract(DATE_PATTERN).dropna()
+    if not parts.empty:
+        year = parts["year"].astype(int)
+        # Two-digit years follow strptime's %y pivot: 69-99 -> 1900s
+        year = year.where(parts["year"].str.len() == 4, year + 2000 - 100 * (year >= 69))
+        parsed[parts.index] = pd.to_datetime(
+            pd.DataFrame({"year": year, "month": parts["month"].astype(int), "day": parts["day"].astype(int)}),
+            errors="coerce",
+        )
+    return parsed
+
+
+def normalize_dates(values):
+    # Series of raw values -> Series of mm/dd/yy strings. Blank values become
+    # "", UNK and anything unparseable pass through unchanged. Each distinct
+    # raw value is only ever converted once.
+    values = pd.Series(values, dtype=object)
+    keys = values.where(values.notna(), "").astype(str).str.strip()
+    if len(_normalized) > MEMO_LIMIT:
+        _normalized.clear()
+    pending = pd.Series([key for key in keys.unique() if key not in _normalized], dtype=object)
+    if not pending.empty:
+        formatted = parse_dates(pending).dt.strftime(DATE_FORMAT)
+        blank = pending.str.upper().isin(BLANK_VALUES)
+        for key, date, is_blank in zip(pending, formatted, blank):
+            _normalized[key] = "" if is_blank else (date if isinstance(date, str) else key)
+    return keys.map(_normalized)
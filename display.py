@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from dates import normalize_dates
+from stages import HOLD_CLASSES
+
+PETPOINT_ANIMAL_URL = "https://sms.petpoint.com/sms3/enhanced/animal/"
+# Shown for an animal on hold that has no clear date yet
+UNKNOWN_CLEAR_DATE = "UNK"
+# The map's filter toggles: any "Hold - ..." stage, and the PetPoint animal
+# types, whose order fixes their filter bits
+ANY_HOLD = "Any hold"
+SPECIES = ["Dog", "Cat", "Bird", "Other", "Livestock", "Equine"]
+
+
+def clear_date_labels(animal_df, clear_dates):
+    # Each animal's clear date as shown on the map: normalized, or UNK for a
+    # hold (HoldClass) that has none yet
+    dates = normalize_dates(animal_df["AnimalNumber"].astype(str).map(clear_dates))
+    return dates.mask((animal_df["HoldClass"] != "").to_numpy() & (dates == ""), UNKNOWN_CLEAR_DATE)
+
+
+def build_display_lines(animal_df, clear_dates):
+    # The per-animal kennel line for the whole inventory in one pass:
+    # name (or animal number) linked to PetPoint, stage abbreviation (the
+    # StageAbbr column) and clear date.
+    numbers = animal_df["AnimalNumber"].astype(str)
+    names = animal_df["AnimalName"].astype(str)
+    unnamed = names.str.lower().eq("nan") | names.str.strip().eq("")
+    names = names.where(~unnamed, numbers.str[-8:]).str.title()
+
+    petpoint_ids = numbers.str.replace(r"\D", "", regex=True)
+    linked = '<a href="' + PETPOINT_ANIMAL_URL + petpoint_ids + '" target="_blank">' + names + '</a>'
+    names = linked.where(petpoint_ids != "", names)
+
+    abbrs = animal_df["StageAbbr"].astype(str)
+    dates = clear_date_labels(animal_df, clear_dates)
+
+    has_abbr = abbrs != ""
+    lines = names.mask(has_abbr, names + ' <span class="stage-abbr">' + abbrs + '</span>')
+    return lines.mask(has_abbr & (dates != ""), lines + ' <span class="clear-date">' + dates + '</span>')
+
+
+def display_keys(animal_df, clear_dates):
+    # A content hash per animal over everything its display line is built
+    # from (number, name, stage and clear date), so a kennel's rendered HTML
+    # can be reused for as long as its animals' keys don't change
+    numbers = animal_df["AnimalNumber"].astype(str)
+    fields = pd.DataFrame({
+        "AnimalNumber": numbers,
+        "AnimalName": animal_df["AnimalName"].astype(str),
+        "Stage": animal_df["Stage"].astype(str),
+        "ClearDate": clear_date_labels(animal_df, clear_dates),
+    })
+    return pd.util.hash_pandas_object(fields, index=False)
+
+
+def filter_masks(animal_df):
+    # Per-animal bitmask for the map's client-side filters: one bit for any
+    # hold stage, one per hold class (HOLD_CLASSES order), then one per
+    # species. Species are numbered in SPECIES order, so a bit means the same
+    # species in every data version; a type not listed there gets a bit
+    # after them. Returns the masks and the [group, label] of each bit.
+    any_hold = animal_df["Stage"].astype(str).str.strip().str.lower().str.startswith("hold").to_numpy()
+    # Category codes are int8, too narrow to shift into the higher bits
+    hold_codes = animal_df["HoldClass"].cat.codes.to_numpy().astype(np.int64)
+    hold_bits = np.where(hold_codes > 0, np.left_shift(1, hold_codes), 0) | any_hold.astype(int)
+    types = animal_df["AnimalType"].astype(str)
+    species = SPECIES + sorted(set(types.unique()) - set(SPECIES))
+    species_codes = types.astype(pd.CategoricalDtype(species)).cat.codes.to_numpy().astype(np.int64)
+    species_bits = np.left_shift(1, species_codes + 1 + len(HOLD_CLASSES))
+    filters = [["Stage", ANY_HOLD]] + [["Stage", hold] for hold in HOLD_CLASSES] + [["Species", name] for name in species]
+    return (hold_bits | species_bits).tolist(), filters
+
+
+def display_records(animal_df, clear_dates):
+    # What the client-side renderer needs to build each display line itself,
+    # dictionary-encoded: number and name per animal, stage abbreviation,
+    # hold class and clear date as integer codes into the returned lists, and
+    # the filter bitmask (see filter_masks)
+    numbers = animal_df["AnimalNumber"].astype(str)
+    date_codes, dates = pd.factorize(clear_date_labels(animal_df, clear_dates))
+    masks, filters = filter_masks(animal_df)
+    columns = {
+        "number": numbers.tolist(),
+        "name": animal_df["AnimalName"].astype(str).tolist(),
+        "stage": animal_df["StageAbbr"].cat.codes.tolist(),
+        "hold": animal_df["HoldClass"].cat.codes.tolist(),
+        "date": date_codes.tolist(),
+        "mask": masks,
+    }
+    dictionaries = {
+        "stages": animal_df["StageAbbr"].cat.categories.tolist(),
+        "holds": animal_df["HoldClass"].cat.categories.tolist(),
+        "dates": dates.tolist(),
+        "filters": filters,
+    }
+    return columns, dictionaries
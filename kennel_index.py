@@ -0,0 +1,38 @@
+def normalize_location(location):
+    return " ".join(str(location).split())
+
+
+def normalize_sublocation(sublocation):
+    # "1", " 01" and "01" are the same kennel
+    sublocation = normalize_location(sublocation)
+    return sublocation.zfill(2) if sublocation.isdigit() else sublocation
+
+
+def build_kennel_index(animal_df):
+    # (Location_1, SubLocation) -> row positions, plus (Location_1, None) ->
+    # every row in that location. Positions keep the frame's row order.
+    index = {}
+    locations = animal_df["Location_1"].map(normalize_location)
+    sublocations = animal_df["SubLocation"].map(normalize_sublocation)
+    for pos, (location, sublocation) in enumerate(zip(locations, sublocations)):
+        index.setdefault((location, sublocation), []).append(pos)
+        index.setdefault((location, None), []).append(pos)
+    return index
+
+
+def kennel_positions(index, location, sublocations=None):
+    location = normalize_location(location)
+    if sublocations is None:
+        return index.get((location, None), [])
+    if isinstance(sublocations, str):
+        return index.get((location, normalize_sublocation(sublocations)), [])
+    return sorted(
+        pos for sublocation in sublocations
+        for pos in index.get((location, normalize_sublocation(sublocation)), [])
+    )
+
+
+def occupied_sublocations(index, location):
+    # Sublocations of a location that have at least one animal, in row order
+    location = normalize_location(location)
+    return [sub for (loc, sub) in index if loc == location and sub is not None]
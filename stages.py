@@ -0,0 +1,76 @@
+import re
+
+import pandas as pd
+
+# --- Status to Abbreviation Mapping ---
+STATUS_MAP = {
+    'Evaluate': 'EVAL',
+    'Hold - Adopted!': 'ADPT',
+    'Hold - Behavior': 'BEHA',
+    'Hold - Behavior Foster': 'BFOS',
+    'Hold - Behavior Mod.': 'BMOD',
+    'Hold - Bite/Scratch': 'B/S',
+    'Hold - Canisus Program': 'CANISUS',
+    'Hold - Complaint': 'COMP',
+    'Hold - Cruelty Foster': 'CF',
+    'Hold - Dental': 'DENT',
+    'Hold - Doc': 'DOC',
+    'Hold - Evidence!': 'EVID',
+    'Hold - For RTO': 'RTO',
+    'Hold - Foster': 'FOST',
+    'Hold - Legal Notice': 'LEGAL',
+    'Hold - Media!': 'MEDIA',
+    'Hold - Meet and Greet': 'M+G',
+    'Hold - Offsite': 'OFFSITE',
+    'Hold - Possible Adoption': 'PADPT',
+    'Hold - Pups at the Pen!': 'PEN',
+    'Hold - Rescue': 'RESC',
+    'Hold - SAFE Foster': 'SAFE',
+    'Hold - Special Event': 'SPEC',
+    'Hold - Stray': 'STRAY',
+    'Hold - Surgery': 'SX',
+}
+
+# Longest keys first so e.g. 'Hold - Behavior Foster' wins over 'Hold - Behavior'
+_STATUS_PATTERN = re.compile(
+    "^(?:" + "|".join(re.escape(key) for key in sorted(STATUS_MAP, key=len, reverse=True)) + ")",
+    re.IGNORECASE,
+)
+_STATUS_BY_KEY = {key.lower(): abbr for key, abbr in STATUS_MAP.items()}
+# raw stage string -> abbreviation; stages only take a few dozen values
+_status_memo = {}
+
+def map_status(stage):
+    abbr = _status_memo.get(stage)
+    if abbr is None:
+        match = _STATUS_PATTERN.match(stage)
+        if match:
+            abbr = _STATUS_BY_KEY[match.group(0).lower()]
+        elif 'evaluate' in stage.lower():
+            abbr = STATUS_MAP['Evaluate']
+        else:
+            abbr = ""
+        _status_memo[stage] = abbr
+    return abbr
+
+def stage_abbreviations(stages):
+    # Classify each distinct stage once and broadcast as a categorical column
+    stages = stages.astype(str)
+    return stages.map({stage: map_status(stage) for stage in stages.unique()}).astype("category")
+
+# --- Holds that need a clear date ---
+# Any stage mentioning one of these is that kind of hold; listed in the order
+# the clear-date form shows them. Stages that aren't holds get "".
+HOLD_CLASSES = ['Bite/Scratch', 'Stray', 'Legal']
+HOLD_CLASS_DTYPE = pd.CategoricalDtype([""] + HOLD_CLASSES)
+
+def hold_class(stage):
+    stage = stage.lower()
+    for hold in HOLD_CLASSES:
+        if hold.lower() in stage:
+            return hold
+    return ""
+
+def hold_classes(stages):
+    stages = stages.astype(str)
+    return stages.map({stage: hold_class(stage) for stage in stages.unique()}).astype(HOLD_CLASS_DTYPE)